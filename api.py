@@ -0,0 +1,339 @@
+"""Local HTTP API over the dashboard's logic layer.
+
+Serves the same cached dataset and query cache as the Streamlit pages.
+Start it inside the dashboard process by setting ``DASHBOARD_API_PORT``,
+or on its own with ``python api.py --port 8502``.
+
+Endpoints (all ``GET``)::
+
+    /version              loaded dataset version and load time
+    /filter               rows of filter_data
+    /group-means          mean percentage per behavior of the filtered rows
+    /deviations           calculate_deviations for ``animal``
+    /history              behavior history of ``animal``, or of sex/group means
+    /trends               period-over-period trends of every series
+
+Filters use ``start``/``end`` (``YYYY-MM``, default: latest month),
+``animal`` or repeated ``sex``/``group`` parameters, and ``behavior`` for
+histories. ``/trends`` takes ``window``, repeated ``level`` values and
+a ``metric`` to rank by absolute change. Results are JSON pages (``offset``/``limit``) or, with
+``format=arrow`` or an ``Accept: application/vnd.apache.arrow.stream``
+header, an Arrow IPC stream written batch by batch. Every result carries
+an ETag derived from the dataset version, and ``If-None-Match`` requests
+for an unchanged version get ``304 Not Modified``.
+"""
+
+import argparse
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pandas as pd
+import pyarrow as pa
+from pandas.tseries.offsets import MonthEnd
+
+import queries
+from cache import query_cache
+from trends import LEVELS, METRICS, biggest_movers
+from warmup import SEX_OPTIONS, latest_period
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+
+
+class BadRequest(ValueError):
+    """Raised for query parameters the API cannot use."""
+
+
+def _param(params, name, default=None):
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def _month_start(value):
+    try:
+        period = pd.Period(value, freq="M")
+    except ValueError as exc:
+        raise BadRequest(f"Invalid month {value!r}, expected YYYY-MM") from exc
+    if pd.isna(period):
+        raise BadRequest(f"Invalid month {value!r}, expected YYYY-MM")
+    return pd.Timestamp(year=period.year, month=period.month, day=1)
+
+
+def _period(params, df):
+    """Return the ``select_period`` range described by ``start``/``end``."""
+    if "start" not in params and "end" not in params:
+        return latest_period(df)
+    start_date = _month_start(_param(params, "start", _param(params, "end")))
+    end_date = _month_start(_param(params, "end", _param(params, "start"))) + MonthEnd(1)
+    if start_date > end_date:
+        raise BadRequest("start cannot be after end")
+    return start_date, end_date
+
+
+def _filters(params, df):
+    """Return ``select_filters``-style options, defaulting to every sex and group."""
+    animal = _param(params, "animal")
+    if animal is not None:
+        return "By Individual", animal, None, None
+    sexes = params.get("sex", SEX_OPTIONS)
+    groups = params.get("group", list(df["Social Group"].unique()))
+    return "By Sex and Social Group", None, sexes, groups
+
+
+def _etag_matches(header, etag):
+    """Return whether an ``If-None-Match`` header value matches ``etag``.
+
+    The header is a comma-separated list of (possibly weak) ETags or ``*``.
+    """
+    if not header:
+        return False
+    tags = {tag.strip() for tag in header.split(",")}
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _filtered_args(dataset, params):
+    start_date, end_date = _period(params, dataset.df)
+    filter_option, animal, sexes, groups = _filters(params, dataset.df)
+    return dict(
+        start_date=start_date,
+        end_date=end_date,
+        filter_option=filter_option,
+        animal=animal,
+        sexes=sexes,
+        groups=groups,
+    )
+
+
+def filter_endpoint(dataset, params):
+    return queries.filtered_data(dataset, **_filtered_args(dataset, params))
+
+
+def group_means_endpoint(dataset, params):
+    return queries.group_means(dataset, **_filtered_args(dataset, params))
+
+
+def deviations_endpoint(dataset, params):
+    animal = _param(params, "animal")
+    if animal is None:
+        raise BadRequest("animal is required")
+    start_date, end_date = _period(params, dataset.df)
+    if queries.filtered_data(dataset, start_date, end_date, "By Individual", animal=animal).empty:
+        return pd.DataFrame(columns=["Unified Behavior", "Percentage", "Individual", "Group", "All"])
+    deviations = queries.behavior_deviations(dataset, start_date, end_date, animal)
+    return deviations.rename_axis("Unified Behavior").reset_index()
+
+
+def history_endpoint(dataset, params):
+    behavior = _param(params, "behavior")
+    if behavior is None:
+        raise BadRequest("behavior is required")
+    filter_option, animal, sexes, groups = _filters(params, dataset.df)
+    if filter_option == "By Individual":
+        return queries.behavior_history(dataset, animal, behavior)
+    return queries.behavior_history_by_filters(dataset, sexes=sexes, groups=groups, behavior=behavior)
+
+
+def trends_endpoint(dataset, params):
+    try:
+        window = int(_param(params, "window", 3))
+    except ValueError as exc:
+        raise BadRequest("window must be an integer") from exc
+    if window < 1:
+        raise BadRequest("window must be at least 1")
+    levels = params.get("level", LEVELS)
+    summary = queries.trend_summary(dataset, window=window)
+    metric = _param(params, "metric")
+    if metric is None:
+        return summary[summary["Level"].isin(levels)].reset_index(drop=True)
+    if metric not in METRICS:
+        raise BadRequest(f"metric must be one of {', '.join(METRICS)}")
+    return biggest_movers(summary, metric, levels=levels, top=len(summary))
+
+
+ENDPOINTS = {
+    "/filter": filter_endpoint,
+    "/group-means": group_means_endpoint,
+    "/deviations": deviations_endpoint,
+    "/history": history_endpoint,
+    "/trends": trends_endpoint,
+}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Answer API requests from the server's :class:`data_utils.DatasetStore`."""
+
+    server_version = "BehaviorDashboardAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        try:
+            dataset = self.server.store.current()
+        except FileNotFoundError:
+            self._send_json(503, {"error": "No dataset loaded"})
+            return
+        except Exception:
+            logger.exception("Failed to load dataset for %s", self.path)
+            self._send_json(500, {"error": "Failed to load dataset"})
+            return
+
+        if url.path == "/version":
+            etag = f'"{dataset.version}"'
+            if self._not_modified(etag):
+                return
+            self._send_json(
+                200,
+                {
+                    "version": dataset.version,
+                    "loaded_at": dataset.loaded_at.isoformat(),
+                    "source": dataset.source,
+                },
+                etag=etag,
+            )
+            return
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            self._send_json(404, {"error": f"Unknown endpoint {url.path}"})
+            return
+
+        fmt = _param(params, "format")
+        if fmt is None:
+            fmt = "arrow" if ARROW_STREAM in self.headers.get("Accept", "") else "json"
+        if fmt not in ("json", "arrow"):
+            self._send_json(400, {"error": f"Unknown format {fmt!r}"})
+            return
+        try:
+            offset = int(_param(params, "offset", 0))
+            limit = int(_param(params, "limit", DEFAULT_LIMIT if fmt == "json" else 0))
+        except ValueError:
+            offset = limit = -1
+        if offset < 0 or limit < 0:
+            self._send_json(400, {"error": "offset and limit must be non-negative integers"})
+            return
+        try:
+            with query_cache.foreground():
+                frame = endpoint(dataset, params)
+        except BadRequest as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        except Exception:
+            logger.exception("Failed to answer %s", self.path)
+            self._send_json(500, {"error": "Internal server error"})
+            return
+
+        etag = f'"{dataset.version}-{fmt}"'
+        if self._not_modified(etag):
+            return
+        if fmt == "arrow":
+            self._send_arrow(frame, offset, limit, etag)
+        else:
+            self._send_page(url.path, params, frame, offset, min(limit or DEFAULT_LIMIT, MAX_LIMIT), dataset.version, etag)
+
+    def _not_modified(self, etag):
+        """Answer ``304 Not Modified`` if the request's ``If-None-Match`` matches ``etag``."""
+        if not _etag_matches(self.headers.get("If-None-Match"), etag):
+            return False
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        return True
+
+    def _send_page(self, path, params, frame, offset, limit, version, etag):
+        total = len(frame)
+        page = frame.iloc[offset:offset + limit]
+        next_url = None
+        if offset + limit < total:
+            next_params = dict(params, offset=[str(offset + limit)], limit=[str(limit)])
+            next_url = f"{path}?{urlencode(next_params, doseq=True)}"
+        self._send_json(
+            200,
+            {
+                "version": version,
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "next": next_url,
+                "data": json.loads(page.to_json(orient="records", date_format="iso")),
+            },
+            etag=etag,
+        )
+
+    def _send_arrow(self, frame, offset, limit, etag):
+        if offset or limit:
+            frame = frame.iloc[offset:offset + limit if limit else None]
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        self.send_response(200)
+        self.send_header("Content-Type", ARROW_STREAM)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        # HTTP/1.0 responses end when the connection closes, so batches are
+        # written as they are produced instead of buffering the whole body.
+        with pa.ipc.new_stream(self.wfile, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=MAX_LIMIT):
+                writer.write_batch(batch)
+
+    def _send_json(self, status, payload, etag=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def end_headers(self):
+        # The format can be negotiated with Accept, so caches must keep
+        # JSON and Arrow bodies of the same URL apart.
+        self.send_header("Vary", "Accept")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a dataset store."""
+
+    daemon_threads = True
+
+    def __init__(self, address, store):
+        super().__init__(address, ApiHandler)
+        self.store = store
+
+
+def serve_in_background(store, host="127.0.0.1", port=8502):
+    """Start the API on a daemon thread of the current process."""
+    server = ApiServer((host, port), store)
+    thread = threading.Thread(target=server.serve_forever, name="query-api", daemon=True)
+    thread.start()
+    logger.info("Query API listening on http://%s:%d", host, server.server_port)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--path", default="reports/behavior.csv")
+    args = parser.parse_args()
+
+    from data_utils import get_store
+
+    logging.basicConfig(level=logging.INFO)
+    # This process is the API server; don't start a second one from the environment.
+    store = get_store(args.path, serve_api=False)
+    store.current()
+    server = ApiServer((args.host, args.port), store)
+    logger.info("Query API listening on http://%s:%d", args.host, args.port)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 import streamlit as st
+from data_utils import get_store
+from warmup import warmup
+from ui import warmup_progress
 
 st.set_page_config(
     page_title="Home",
@@ -19,6 +22,14 @@ def main():
         Utiliza el menú lateral para navegar por las funcionalidades.
         """
     )
+    try:
+        # Loading the dataset here starts the background warm-up of every page.
+        get_store().current()
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        st.error(f"Failed to load data: {exc}")
+    warmup_progress(warmup.status())
 
 if __name__ == "__main__":
     main()
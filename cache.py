@@ -0,0 +1,108 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+class QueryCache:
+    """Process-wide cache of derived views keyed by dataset version.
+
+    Keys are tuples whose first element is the dataset version, so entries
+    of a replaced dataset can be dropped in one pass. Cached values are
+    shared between sessions and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._foreground = 0
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing it at most once.
+
+        Concurrent callers asking for the same key while it is being
+        computed wait for that result instead of computing it again.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._pending[key] = future
+                self.misses += 1
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._pending.pop(key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._pending.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def items(self):
+        """Return a snapshot list of ``(key, value)`` pairs."""
+        with self._lock:
+            return list(self._entries.items())
+
+    def retain_version(self, version):
+        """Drop every entry that does not belong to ``version``."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] != version]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    @contextmanager
+    def foreground(self):
+        """Mark a user request as in flight so background work yields to it."""
+        with self._lock:
+            self._foreground += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._foreground -= 1
+                if self._foreground == 0:
+                    self._idle.notify_all()
+
+    def wait_until_idle(self, timeout=None):
+        """Block until no user request is in flight.
+
+        Returns ``False`` if ``timeout`` elapsed first.
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: self._foreground == 0, timeout)
+
+
+query_cache = QueryCache()
@@ -1,8 +1,71 @@
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import wait
+from dataclasses import dataclass
+from io import BytesIO
+
 import pandas as pd
 import streamlit as st
+from watchdog.events import (
+    EVENT_TYPE_CLOSED,
+    EVENT_TYPE_CREATED,
+    EVENT_TYPE_MODIFIED,
+    EVENT_TYPE_MOVED,
+    FileSystemEventHandler,
+)
+from watchdog.observers import Observer
+
+from api import serve_in_background
+from cache import query_cache
+from logic import from_month_ordinal, get_date_range, to_month_ordinal
+from memory import log_memory_report
+from warmup import warmup
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = "reports/behavior.csv"
+DIMENSIONS = ["Focal Name", "Unified Behavior", "Sex", "Social Group"]
+
+
+def read_behavior_csv(source):
+    """Parse a behavior CSV from a path or file-like object."""
+    df = pd.read_csv(source)
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def compact_schema(df):
+    """Return ``df`` in the compact in-memory layout.
+
+    Dimensions become categoricals (small integer codes), "Date" becomes
+    an int32 month ordinal (see :func:`logic.to_month_ordinal`) and
+    "Percentage" becomes float32. Every function in :mod:`logic` accepts
+    either layout.
+    """
+    columns = {col: df[col].astype("category") for col in DIMENSIONS if col in df}
+    if not pd.api.types.is_integer_dtype(df["Date"]):
+        columns["Date"] = to_month_ordinal(df["Date"])
+    columns["Percentage"] = df["Percentage"].astype("float32")
+    return df.assign(**columns)
+
+
+def standard_schema(df):
+    """Return ``df`` in the layout produced by :func:`read_behavior_csv`."""
+    columns = {
+        col: df[col].astype(object)
+        for col in DIMENSIONS
+        if col in df and isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    if pd.api.types.is_integer_dtype(df["Date"]):
+        columns["Date"] = from_month_ordinal(df["Date"])
+    columns["Percentage"] = df["Percentage"].astype("float64")
+    return df.assign(**columns)
+
 
 @st.cache_data
-def load_data(path="reports/behavior.csv"):
+def load_data(path=DATA_PATH):
     """Load the behavior dataset.
 
     Parameters
@@ -15,17 +78,13 @@ def load_data(path="reports/behavior.csv"):
     pd.DataFrame
     """
     try:
-        df = pd.read_csv(path)
-        df["Date"] = pd.to_datetime(df["Date"])
-        return df
+        return read_behavior_csv(path)
     except FileNotFoundError:
         st.warning("The file 'behavior.csv' was not found. Upload one below.")
         uploaded = st.file_uploader("Upload behavior.csv", type="csv")
         if uploaded is not None:
             try:
-                df = pd.read_csv(uploaded)
-                df["Date"] = pd.to_datetime(df["Date"])
-                return df
+                return read_behavior_csv(uploaded)
             except Exception as exc:
                 st.error(f"Failed to read uploaded file: {exc}")
     except Exception as exc:
@@ -33,11 +92,275 @@ def load_data(path="reports/behavior.csv"):
     return pd.DataFrame()
 
 
-def check_dataset_freshness(df, days=90):
-    """Warn if the dataset has not been updated recently."""
-    if df.empty:
+@dataclass(frozen=True)
+class Dataset:
+    """Immutable snapshot of the behavior data.
+
+    Attributes
+    ----------
+    df : pd.DataFrame
+        The parsed data. Shared between sessions, so treat it as read-only.
+    version : str
+        Content hash identifying this snapshot; keys every derived cache.
+    loaded_at : pd.Timestamp
+        When the snapshot was read.
+    source : str
+        File path the snapshot was read from, or ``"upload"``.
+    """
+
+    df: pd.DataFrame
+    version: str
+    loaded_at: pd.Timestamp
+    source: str
+
+
+def read_dataset(path=DATA_PATH, compact=False):
+    """Read ``path`` into a :class:`Dataset` versioned by its content.
+
+    With ``compact=True`` the frame is stored in :func:`compact_schema`.
+    """
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    df = read_behavior_csv(BytesIO(raw))
+    return Dataset(
+        df=compact_schema(df) if compact else df,
+        version=hashlib.sha1(raw).hexdigest()[:12],
+        loaded_at=pd.Timestamp.now(),
+        source=path,
+    )
+
+
+def dataset_from_frame(df, source="upload"):
+    """Wrap an already loaded frame, e.g. an uploaded CSV, in a :class:`Dataset`."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return Dataset(
+        df=df,
+        version=digest.hexdigest()[:12],
+        loaded_at=pd.Timestamp.now(),
+        source=source,
+    )
+
+
+def file_signature(path):
+    """Return a cheap ``(mtime, size)`` fingerprint of ``path``."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _DatasetFileHandler(FileSystemEventHandler):
+    """Forward changes of the watched CSV to its store.
+
+    Only events that can change the content count: opening or closing the
+    file without writing, as every rebuild does, must not schedule another.
+    """
+
+    event_types = {EVENT_TYPE_CREATED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED, EVENT_TYPE_CLOSED}
+
+    def __init__(self, store):
+        self.store = store
+        self.target = os.path.abspath(store.path)
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in self.event_types:
+            return
+        paths = {event.src_path, getattr(event, "dest_path", "")}
+        if self.target in {os.path.abspath(p) for p in paths if p}:
+            self.store.schedule_rebuild()
+
+
+class DatasetStore:
+    """Hold the current :class:`Dataset` for every session of the process.
+
+    A changed file is rebuilt on a background thread and swapped in as a
+    whole once ``warm(dataset)`` has finished precomputing its views, or
+    after ``warm_timeout`` seconds at the latest, so a session that already
+    holds a snapshot keeps using it and no request waits for a rebuild.
+    Callbacks registered with :meth:`subscribe` receive each new snapshot
+    after it has been published.
+    """
+
+    def __init__(self, path=DATA_PATH, warm=None, debounce=1.0, compact=False, warm_timeout=30.0):
+        self.path = path
+        self.compact = compact
+        self.warm = warm
+        self.warm_timeout = warm_timeout
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._dataset = None
+        self._signature = None
+        self._failed_signature = None
+        self._timer = None
+        self._observer = None
+        self._listeners = []
+
+    def subscribe(self, callback):
+        """Call ``callback(dataset)`` whenever a new version is published."""
+        self._listeners.append(callback)
+
+    def current(self):
+        """Return the current snapshot without waiting for a rebuild.
+
+        Only the very first call reads the file synchronously. Later calls
+        return the published snapshot and schedule a background rebuild
+        if the file changed without the watcher noticing.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the CSV does not exist and nothing has been loaded yet.
+        """
+        dataset = self._dataset
+        if dataset is None:
+            with self._rebuild_lock:
+                if self._dataset is None:
+                    signature = file_signature(self.path)
+                    self._publish(read_dataset(self.path, compact=self.compact), signature)
+                    if self.warm is not None:
+                        self.warm(self._dataset)
+                return self._dataset
+        try:
+            signature = file_signature(self.path)
+        except FileNotFoundError:
+            return dataset
+        if signature not in (self._signature, self._failed_signature) and self._timer is None:
+            self.schedule_rebuild()
+        return dataset
+
+    def schedule_rebuild(self, delay=None):
+        """Rebuild after ``delay`` seconds, coalescing bursts of file events."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce if delay is None else delay, self.rebuild)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def rebuild(self):
+        """Read a changed file, warm its views and swap it in.
+
+        A file that fails to parse is logged and skipped; the current
+        snapshot stays published and the file is not read again until its
+        signature changes.
+        """
+        with self._lock:
+            self._timer = None
+        with self._rebuild_lock:
+            signature = None
+            try:
+                signature = file_signature(self.path)
+                if signature == self._signature:
+                    return self._dataset
+                if signature == self._failed_signature:
+                    return None
+                dataset = read_dataset(self.path, compact=self.compact)
+            except Exception:
+                logger.exception("Failed to rebuild dataset from %s", self.path)
+                self._failed_signature = signature
+                return None
+            previous = self._dataset
+            if previous is not None and dataset.version == previous.version:
+                self._signature = signature
+                return previous
+            if self.warm is not None:
+                _, pending = wait(self.warm(dataset), timeout=self.warm_timeout)
+                if pending:
+                    logger.warning(
+                        "Dataset %s published with %d views still warming",
+                        dataset.version,
+                        len(pending),
+                    )
+            self._publish(dataset, signature)
+            logger.info(
+                "Dataset %s swapped in (was %s)",
+                dataset.version,
+                previous.version if previous is not None else None,
+            )
+        return dataset
+
+    def _publish(self, dataset, signature):
+        with self._lock:
+            self._dataset, self._signature = dataset, signature
+        for callback in self._listeners:
+            callback(dataset)
+
+    def watch(self):
+        """Start a watchdog observer that rebuilds when the CSV changes."""
+        if self._observer is not None:
+            return self._observer
+        observer = Observer()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            observer.schedule(_DatasetFileHandler(self), directory, recursive=False)
+            observer.start()
+        except OSError as exc:
+            logger.warning("Not watching %s: %s", directory, exc)
+            return None
+        self._observer = observer
+        return observer
+
+    def stop(self):
+        """Stop the watcher and any pending rebuild."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=DATA_PATH, serve_api=True):
+    """Return the process-wide :class:`DatasetStore` for ``path``.
+
+    The first store created for a path watches the file, warms the views
+    of each new version before publishing it and then drops cache entries
+    of the previous version. If ``DASHBOARD_API_PORT`` is set and
+    ``serve_api`` is true, the query API (see :mod:`api`) is served from
+    the same process, and ``DASHBOARD_COMPACT_SCHEMA=1`` keeps the data in
+    :func:`compact_schema`.
+    """
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            compact = os.environ.get("DASHBOARD_COMPACT_SCHEMA") == "1"
+            store = _stores[path] = DatasetStore(path, warm=warmup.start, compact=compact)
+            store.subscribe(lambda dataset: query_cache.retain_version(dataset.version))
+            store.subscribe(log_memory_report)
+            store.watch()
+            port = os.environ.get("DASHBOARD_API_PORT")
+            if port and serve_api:
+                try:
+                    serve_in_background(store, port=int(port))
+                except OSError as exc:
+                    logger.warning("Query API not started on port %s: %s", port, exc)
+        return store
+
+
+def load_dataset(path=DATA_PATH):
+    """Return the current :class:`Dataset`, falling back to an upload prompt."""
+    try:
+        return get_store(path).current()
+    except FileNotFoundError:
+        return dataset_from_frame(load_data(path))
+    except Exception as exc:
+        st.error(f"Failed to load data: {exc}")
+    return dataset_from_frame(pd.DataFrame())
+
+
+def check_dataset_freshness(dataset, days=90):
+    """Show which dataset version is loaded and warn if its data is old."""
+    if dataset.df.empty:
         return
-    latest_date = df["Date"].max()
+    st.sidebar.caption(
+        f"Data version {dataset.version}, loaded {dataset.loaded_at:%Y-%m-%d %H:%M}"
+    )
+    _, latest_date = get_date_range(dataset.df)
     if (pd.Timestamp.now() - latest_date) > pd.Timedelta(days=days):
         st.info(
             "Behavior data might be outdated. Consider uploading a newer CSV file."
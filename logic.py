@@ -1,9 +1,51 @@
+import numpy as np
 import pandas as pd
 
 
+def to_month_ordinal(dates):
+    """Return int32 months since January 1970 for datetime values."""
+    return pd.Series(
+        np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[M]").astype("int32"),
+        index=getattr(dates, "index", None),
+    )
+
+
+def from_month_ordinal(ordinals):
+    """Return first-of-month timestamps for int month ordinals."""
+    return pd.Series(
+        np.asarray(ordinals, dtype="int64").astype("datetime64[M]").astype("datetime64[ns]"),
+        index=getattr(ordinals, "index", None),
+    )
+
+
+def _month_ordinal(timestamp):
+    return (timestamp.year - 1970) * 12 + timestamp.month - 1
+
+
+def _decode_dates(df):
+    """Return ``df`` with int month ordinals in "Date" expanded to timestamps."""
+    if "Date" in df and pd.api.types.is_integer_dtype(df["Date"]):
+        return df.assign(Date=from_month_ordinal(df["Date"]))
+    return df
+
+
+def get_date_range(df):
+    """Return the first and last month of ``df`` as timestamps."""
+    first, last = df["Date"].min(), df["Date"].max()
+    if pd.api.types.is_integer_dtype(df["Date"]):
+        first, last = (pd.Timestamp(np.datetime64(int(value), "M")) for value in (first, last))
+    return first, last
+
+
 def filter_data(df, start_date, end_date, filter_option, animal=None, sexes=None, groups=None):
     """Return data filtered by date range and query options."""
-    subset = df[(df["Date"] >= start_date) & (df["Date"] <= end_date)]
+    dates = df["Date"]
+    if pd.api.types.is_integer_dtype(dates):
+        # Compact schema: a month is kept if its first day lies in the range.
+        first_day = pd.Timestamp(year=start_date.year, month=start_date.month, day=1)
+        start_date = _month_ordinal(start_date) + (start_date > first_day)
+        end_date = _month_ordinal(end_date)
+    subset = df[(dates >= start_date) & (dates <= end_date)]
     if filter_option == "By Individual" and animal:
         subset = subset[subset["Focal Name"] == animal]
     elif filter_option == "By Sex and Social Group":
@@ -11,7 +53,7 @@ def filter_data(df, start_date, end_date, filter_option, animal=None, sexes=None
             subset = subset[subset["Sex"].isin(sexes)]
         if groups is not None:
             subset = subset[subset["Social Group"].isin(groups)]
-    return subset
+    return _decode_dates(subset)
 
 
 def get_behavior_color_map(df):
@@ -25,23 +67,30 @@ def get_behavior_color_map(df):
     return {behavior: colors[i] for i, behavior in enumerate(behaviors)}
 
 
+def calculate_group_means(df_filtered):
+    """Return the mean percentage of each behavior, highest first."""
+    return (
+        df_filtered.groupby("Unified Behavior", observed=True)["Percentage"].mean().reset_index().sort_values(by="Percentage", ascending=False)
+    )
+
+
 def calculate_deviations(df, df_filtered, selected_animal):
     """Compute deviation percentages for a single individual."""
     common_behaviors = df["Unified Behavior"].unique()
 
     all_mean = (
-        df.groupby("Unified Behavior", observed=False)["Percentage"].mean().reindex(common_behaviors, fill_value=0)
+        df.groupby("Unified Behavior", observed=True)["Percentage"].mean().reindex(common_behaviors, fill_value=0)
     )
     group_mean = (
         df[df["Social Group"] == df_filtered["Social Group"].iloc[0]]
-        .groupby("Unified Behavior", observed=False)["Percentage"].mean().reindex(common_behaviors, fill_value=0)
+        .groupby("Unified Behavior", observed=True)["Percentage"].mean().reindex(common_behaviors, fill_value=0)
     )
     individual_mean_historical = (
         df[df["Focal Name"] == selected_animal]
-        .groupby("Unified Behavior", observed=False)["Percentage"].mean().reindex(common_behaviors, fill_value=0)
+        .groupby("Unified Behavior", observed=True)["Percentage"].mean().reindex(common_behaviors, fill_value=0)
     )
     individual_mean_selected = (
-        df_filtered.groupby("Unified Behavior", observed=False)["Percentage"].mean().reindex(common_behaviors, fill_value=0)
+        df_filtered.groupby("Unified Behavior", observed=True)["Percentage"].mean().reindex(common_behaviors, fill_value=0)
     )
 
     deviations = pd.DataFrame(
@@ -59,7 +108,7 @@ def calculate_deviations(df, df_filtered, selected_animal):
 def get_behavior_history(df, animal, behavior):
     """Return behavior percentages for a specific animal over time."""
     subset = df[(df["Focal Name"] == animal) & (df["Unified Behavior"] == behavior)]
-    return subset.sort_values("Date")[["Date", "Percentage"]]
+    return _decode_dates(subset.sort_values("Date")[["Date", "Percentage"]])
 
 
 def get_behavior_history_by_filters(df, sexes=None, groups=None, behavior=None):
@@ -70,4 +119,92 @@ def get_behavior_history_by_filters(df, sexes=None, groups=None, behavior=None):
     if groups is not None:
         subset = subset[subset["Social Group"].isin(groups)]
     grouped = subset.groupby("Date", as_index=False)["Percentage"].mean()
-    return grouped.sort_values("Date")[["Date", "Percentage"]]
+    return _decode_dates(grouped.sort_values("Date")[["Date", "Percentage"]])
+
+
+def get_behavior_matrix(df, sexes=None, groups=None):
+    """Return month-aligned percentages, one column per (group, animal, behavior).
+
+    Every combination of the animals and behaviors present is included, so
+    the columns can be reshaped into ``(group/animal, behavior)`` blocks;
+    months without data are NaN.
+    """
+    subset = df
+    if sexes is not None:
+        subset = subset[subset["Sex"].isin(sexes)]
+    if groups is not None:
+        subset = subset[subset["Social Group"].isin(groups)]
+    matrix = subset.pivot_table(
+        index="Date",
+        columns=["Social Group", "Focal Name", "Unified Behavior"],
+        values="Percentage",
+        aggfunc="mean",
+        observed=True,
+    )
+    focals = matrix.columns.droplevel("Unified Behavior").unique()
+    behaviors = sorted(matrix.columns.get_level_values("Unified Behavior").unique())
+    columns = pd.MultiIndex.from_tuples(
+        [(group, animal, behavior) for group, animal in focals for behavior in behaviors],
+        names=matrix.columns.names,
+    )
+    return matrix.reindex(columns=columns)
+
+
+def calculate_behavior_covariation(df, sexes=None, groups=None, min_periods=6):
+    """Return behavior-by-behavior correlations over time for every animal.
+
+    The result is indexed by ``(Social Group, Focal Name, Unified Behavior)``
+    with one column per behavior. Each animal's block holds the Pearson
+    correlation of its monthly series for every pair of behaviors, using
+    the months where both were recorded; pairs sharing fewer than
+    ``min_periods`` months are NaN. All blocks are computed at once from a
+    single pivot, so colony and group matrices are plain means of it, e.g.
+    ``result.groupby(level="Unified Behavior").mean()``.
+    """
+    matrix = get_behavior_matrix(df, sexes=sexes, groups=groups)
+    if matrix.empty:
+        return pd.DataFrame(index=matrix.columns, dtype="float64")
+    behaviors = list(matrix.columns.get_level_values("Unified Behavior").unique())
+    n_focals, n_behaviors = len(matrix.columns) // len(behaviors), len(behaviors)
+
+    values = matrix.to_numpy(dtype="float64").reshape(len(matrix), n_focals, n_behaviors)
+    observed = ~np.isnan(values)
+    weights = observed.astype("float64")
+    # Centering each series keeps the one-pass sums small, so a constant
+    # series gets a variance of zero instead of rounding noise.
+    means = np.where(observed, values, 0.0).sum(axis=0) / np.maximum(weights.sum(axis=0), 1)
+    x = np.where(observed, values - means, 0.0)
+
+    # Pairwise-complete sums for each focal's behavior pairs: [focal, a, b].
+    count = np.einsum("tka,tkb->kab", weights, weights)
+    sum_a = np.einsum("tka,tkb->kab", x, weights)
+    sum_sq_a = np.einsum("tka,tkb->kab", x * x, weights)
+    sum_ab = np.einsum("tka,tkb->kab", x, x)
+    sum_b = sum_a.transpose(0, 2, 1)
+    sum_sq_b = sum_sq_a.transpose(0, 2, 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_ab - sum_a * sum_b / count
+        var_a = sum_sq_a - sum_a**2 / count
+        var_b = sum_sq_b - sum_b**2 / count
+        tiny = np.finfo("float64").eps * count
+        var_a[var_a <= tiny] = 0.0
+        var_b[var_b <= tiny] = 0.0
+        corr = cov / np.sqrt(var_a * var_b)
+    corr[(count < max(min_periods, 2)) | ~np.isfinite(corr)] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+
+    return pd.DataFrame(
+        corr.reshape(n_focals * n_behaviors, n_behaviors),
+        index=matrix.columns,
+        columns=pd.Index(behaviors, name="Unified Behavior"),
+    )
+
+
+def get_strongest_pairs(corr_matrix, top=10):
+    """Return the behavior pairs of ``corr_matrix`` with the largest absolute correlation."""
+    upper = np.triu(np.ones(corr_matrix.shape, dtype=bool), k=1)
+    pairs = corr_matrix.where(upper).stack().rename("Correlation")
+    pairs.index.names = ["Behavior A", "Behavior B"]
+    order = pairs.abs().sort_values(ascending=False).index
+    return pairs.reindex(order).head(top).reset_index()
@@ -0,0 +1,146 @@
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import fields, is_dataclass
+
+import numpy as np
+import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from cache import query_cache
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL = 3600
+
+
+def enabled():
+    """Return whether per-session tracking and the sidebar view are on."""
+    return os.environ.get("DASHBOARD_MEMORY_DEBUG") == "1"
+
+
+def deep_size(obj, _seen=None):
+    """Return the approximate deep size of ``obj`` in bytes.
+
+    pandas objects report ``memory_usage(deep=True)``, plotly figures are
+    measured through their JSON-ready dict and containers are walked
+    recursively, counting shared objects once.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, "to_plotly_json"):
+        return deep_size(obj.to_plotly_json(), _seen)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, _seen) + deep_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, _seen) for item in obj)
+    elif is_dataclass(obj):
+        size += sum(deep_size(getattr(obj, f.name), _seen) for f in fields(obj))
+    return size
+
+
+def format_bytes(size):
+    """Return ``size`` as a short human readable string."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def cache_footprint(cache=query_cache):
+    """Return the deep size of every cached query, one row per entry."""
+    rows = [
+        {
+            "version": key[0],
+            "query": key[1],
+            "key": ", ".join(map(str, key[2:])),
+            "bytes": deep_size(value),
+        }
+        for key, value in cache.items()
+    ]
+    return pd.DataFrame(rows, columns=["version", "query", "key", "bytes"])
+
+
+def layout_savings(standard, compact):
+    """Compare the deep size of each column in two layouts of the same data."""
+    report = pd.DataFrame(
+        {
+            "standard": standard.memory_usage(deep=True),
+            "compact": compact.memory_usage(deep=True),
+        }
+    )
+    report.loc["Total"] = report.sum()
+    report["saved"] = 1 - report["compact"] / report["standard"]
+    return report
+
+
+class SessionFootprints:
+    """Deep sizes of the objects each session built on its recent runs.
+
+    Sessions are keyed by their Streamlit session id and forgotten after
+    ``SESSION_TTL`` seconds without a recorded object.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def record(self, label, obj):
+        """Record ``obj`` under ``label`` for the running session."""
+        if not enabled():
+            return
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return
+        size = deep_size(obj)
+        now = time.monotonic()
+        with self._lock:
+            _, objects = self._sessions.get(ctx.session_id, (now, {}))
+            objects[label] = size
+            self._sessions[ctx.session_id] = (now, objects)
+            for session_id, (seen, _) in list(self._sessions.items()):
+                if now - seen > SESSION_TTL:
+                    del self._sessions[session_id]
+
+    def report(self):
+        """Return one row per recorded object and session."""
+        with self._lock:
+            rows = [
+                {"session": session_id[:8], "object": label, "bytes": size}
+                for session_id, (_, objects) in self._sessions.items()
+                for label, size in objects.items()
+            ]
+        return pd.DataFrame(rows, columns=["session", "object", "bytes"])
+
+
+session_footprints = SessionFootprints()
+
+
+def log_memory_report(dataset):
+    """Log the deep memory used by the dataset, the query cache and sessions."""
+    caches = cache_footprint()
+    sessions = session_footprints.report()
+    logger.info(
+        "Memory: dataset %s %s, query cache %s in %d entries, %d sessions %s",
+        dataset.version,
+        format_bytes(deep_size(dataset.df)),
+        format_bytes(caches["bytes"].sum()),
+        len(caches),
+        sessions["session"].nunique(),
+        format_bytes(sessions["bytes"].sum()),
+    )
+    for query, size in caches.groupby("query")["bytes"].sum().sort_values(ascending=False).items():
+        logger.info("Memory: query cache %s %s", query, format_bytes(size))
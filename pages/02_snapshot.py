@@ -1,6 +1,9 @@
 import streamlit as st
-from data_utils import load_data, check_dataset_freshness
-from logic import filter_data, calculate_deviations, get_behavior_color_map
+from cache import query_cache
+from memory import session_footprints
+from data_utils import load_dataset, check_dataset_freshness
+from queries import filtered_data, behavior_deviations, behavior_color_map
+from warmup import warmup
 from ui import (
     select_period,
     select_filters,
@@ -8,6 +11,8 @@ from ui import (
     create_deviation_bar_chart,
     download_filtered_data,
     metric_card,
+    warmup_progress,
+    memory_debug,
 )
 
 st.set_page_config(
@@ -17,8 +22,9 @@ st.set_page_config(
 )
 
 
-def run(df):
+def run(dataset):
     """Render the snapshot page."""
+    df = dataset.df
     with st.sidebar.expander("Filters", expanded=True):
         start_date, end_date = select_period(df, key_prefix="snap_")
         filter_option, selected_animal, selected_sex, selected_groups = select_filters(
@@ -28,8 +34,8 @@ def run(df):
             style="radio",
         )
 
-    df_filtered = filter_data(
-        df,
+    df_filtered = filtered_data(
+        dataset,
         start_date,
         end_date,
         filter_option,
@@ -49,7 +55,7 @@ def run(df):
 
     if not df_filtered.empty:
         st.title(chart_title)
-        color_map = get_behavior_color_map(df)
+        color_map = behavior_color_map(dataset)
         st.subheader(f"{start_date.strftime('%b %Y')} - {end_date.strftime('%b %Y')}")
         kpi1 = df_filtered["Date"].dt.to_period("M").nunique()
         kpi2 = df_filtered["Focal Name"].nunique()
@@ -63,6 +69,7 @@ def run(df):
             metric_card("Behaviors", kpi3)
 
         df_sorted = df_filtered.sort_values(by="Percentage", ascending=False)
+        session_footprints.record("sorted subset", df_sorted)
         col_chart, col_dev = st.columns(2)
         with col_chart:
             create_bar_chart(
@@ -75,7 +82,7 @@ def run(df):
 
         with col_dev:
             if filter_option == "By Individual" and selected_animal:
-                deviations = calculate_deviations(df, df_filtered, selected_animal)
+                deviations = behavior_deviations(dataset, start_date, end_date, selected_animal)
                 create_deviation_bar_chart(deviations, "Behavior Deviations")
                 with st.expander("Ver resumen de datos"):
                     st.dataframe(deviations[["Percentage", "Individual", "Group", "All"]])
@@ -87,12 +94,15 @@ def run(df):
 
 
 def main():
-    df = load_data()
-    if df.empty:
+    dataset = load_dataset()
+    if dataset.df.empty:
         st.error("Data could not be loaded.")
         return
-    check_dataset_freshness(df)
-    run(df)
+    check_dataset_freshness(dataset)
+    warmup_progress(warmup.status())
+    with query_cache.foreground():
+        run(dataset)
+    memory_debug(dataset)
 
 
 if __name__ == "__main__":
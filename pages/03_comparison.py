@@ -1,12 +1,16 @@
 import pandas as pd
 import streamlit as st
-from data_utils import load_data, check_dataset_freshness
-from logic import filter_data, get_behavior_color_map
+from cache import query_cache
+from data_utils import load_dataset, check_dataset_freshness
+from queries import filtered_data, behavior_color_map
+from warmup import warmup
 from ui import (
     select_period,
     select_filters,
     create_bar_chart,
     download_filtered_data,
+    warmup_progress,
+    memory_debug,
 )
 
 st.set_page_config(
@@ -16,8 +20,9 @@ st.set_page_config(
 )
 
 
-def run(df):
+def run(dataset):
     """Render the comparison page."""
+    df = dataset.df
     num_fields = st.sidebar.selectbox("Number of Comparison Fields", [2, 3, 4], index=0)
     st.title("Behavior Comparison Dashboard")
 
@@ -37,8 +42,8 @@ def run(df):
                 style="radio",
             )
 
-            df_filtered = filter_data(
-                df,
+            df_filtered = filtered_data(
+                dataset,
                 start_date,
                 end_date,
                 filter_option,
@@ -66,7 +71,7 @@ def run(df):
 
             if not df_filtered.empty:
                 df_grouped = (
-                    df_filtered.groupby("Unified Behavior", observed=False)["Percentage"].mean().reset_index()
+                    df_filtered.groupby("Unified Behavior", observed=True)["Percentage"].mean().reset_index()
                 )
                 current_max = df_grouped["Percentage"].max()
                 max_y = max(max_y, current_max)
@@ -75,7 +80,7 @@ def run(df):
                 comparison_data.append((pd.DataFrame(), chart_title))
 
     behavior_order = None
-    color_map = get_behavior_color_map(df)
+    color_map = behavior_color_map(dataset)
 
     for i in range(num_fields):
         df_filtered, chart_title = comparison_data[i]
@@ -83,7 +88,7 @@ def run(df):
             if not df_filtered.empty:
                 if i == 0:
                     df_grouped_first = (
-                        df_filtered.groupby("Unified Behavior", observed=False)["Percentage"].mean().reset_index().sort_values(by="Percentage", ascending=False)
+                        df_filtered.groupby("Unified Behavior", observed=True)["Percentage"].mean().reset_index().sort_values(by="Percentage", ascending=False)
                     )
                     behavior_order = df_grouped_first["Unified Behavior"].tolist()
                     max_y = max(max_y, df_grouped_first["Percentage"].max())
@@ -104,7 +109,7 @@ def run(df):
     for i, (df_filtered, chart_title) in enumerate(comparison_data):
         if not df_filtered.empty:
             df_grouped = (
-                df_filtered.groupby("Unified Behavior", observed=False)["Percentage"].mean().reset_index()
+                df_filtered.groupby("Unified Behavior", observed=True)["Percentage"].mean().reset_index()
             )
             col_name = f"{chart_titles[i]} ({i+1})"
             if comparison_df.empty:
@@ -128,12 +133,15 @@ def run(df):
 
 
 def main():
-    df = load_data()
-    if df.empty:
+    dataset = load_dataset()
+    if dataset.df.empty:
         st.error("Data could not be loaded.")
         return
-    check_dataset_freshness(df)
-    run(df)
+    check_dataset_freshness(dataset)
+    warmup_progress(warmup.status())
+    with query_cache.foreground():
+        run(dataset)
+    memory_debug(dataset)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,16 @@
 import streamlit as st
-from data_utils import load_data, check_dataset_freshness
-from logic import (
-    get_behavior_history,
-    get_behavior_history_by_filters,
+from cache import query_cache
+from data_utils import load_dataset, check_dataset_freshness
+from queries import behavior_history, behavior_history_by_filters, trend_summary
+from trends import biggest_movers
+from warmup import warmup
+from ui import (
+    select_filters,
+    create_history_line_chart,
+    download_filtered_data,
+    warmup_progress,
+    memory_debug,
 )
-from ui import select_filters, create_history_line_chart
 
 st.set_page_config(
     page_title="📈 Behavior History",
@@ -12,9 +18,15 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+MOVER_LEVELS = {
+    "Individuals": ["Focal Name"],
+    "Groups and sexes": ["Social Group", "Sex", "Colony"],
+}
 
-def run(df):
+
+def run(dataset):
     """Render the behavior history page."""
+    df = dataset.df
     filter_option, sel_animal, sel_sex, sel_groups = select_filters(
         df,
         key_prefix="history_",
@@ -25,11 +37,11 @@ def run(df):
     selected_behavior = st.selectbox("Select Behavior", behaviors, key="history_behavior")
 
     if filter_option == "By Individual" and sel_animal:
-        df_line = get_behavior_history(df, sel_animal, selected_behavior)
+        df_line = behavior_history(dataset, sel_animal, selected_behavior)
         title = f"{selected_behavior} over time for {sel_animal}"
     else:
-        df_line = get_behavior_history_by_filters(
-            df,
+        df_line = behavior_history_by_filters(
+            dataset,
             sexes=sel_sex,
             groups=sel_groups,
             behavior=selected_behavior,
@@ -51,14 +63,40 @@ def run(df):
     else:
         st.info("Not enough data for insights.")
 
+    st.subheader("Biggest movers")
+    col_level, col_metric, col_window = st.columns(3)
+    with col_level:
+        level = st.radio(
+            "Series", list(MOVER_LEVELS), horizontal=True, key="history_movers_level"
+        )
+    with col_metric:
+        metric = st.selectbox(
+            "Rank by",
+            ["MoM Change", "YoY Change", "Rolling Slope"],
+            key="history_movers_metric",
+        )
+    with col_window:
+        window = st.selectbox(
+            "Rolling window (months)", [3, 6, 12], key="history_movers_window"
+        )
+    movers = biggest_movers(trend_summary(dataset, window=window), metric, levels=MOVER_LEVELS[level])
+    if movers.empty:
+        st.info("Not enough data for trends.")
+    else:
+        st.dataframe(movers, hide_index=True)
+        download_filtered_data(movers, key_prefix="movers_")
+
 
 def main():
-    df = load_data()
-    if df.empty:
+    dataset = load_dataset()
+    if dataset.df.empty:
         st.error("Data could not be loaded.")
         return
-    check_dataset_freshness(df)
-    run(df)
+    check_dataset_freshness(dataset)
+    warmup_progress(warmup.status())
+    with query_cache.foreground():
+        run(dataset)
+    memory_debug(dataset)
 
 
 if __name__ == "__main__":
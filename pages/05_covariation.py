@@ -0,0 +1,90 @@
+import streamlit as st
+from cache import query_cache
+from data_utils import load_dataset, check_dataset_freshness
+from logic import get_strongest_pairs
+from queries import behavior_covariation
+from warmup import warmup
+from ui import (
+    select_filters,
+    create_correlation_heatmap,
+    download_filtered_data,
+    warmup_progress,
+    memory_debug,
+)
+
+st.set_page_config(
+    page_title="🔗 Co-variation",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+
+
+def show_matrix(corr_matrix, title, key_prefix):
+    """Render a correlation heatmap with its strongest behavior pairs."""
+    create_correlation_heatmap(corr_matrix, title)
+    pairs = get_strongest_pairs(corr_matrix)
+    if not pairs.empty:
+        with st.expander("Strongest pairs"):
+            st.dataframe(pairs, hide_index=True)
+        download_filtered_data(pairs, key_prefix=key_prefix)
+
+
+def run(dataset):
+    """Render the behavior co-variation page."""
+    df = dataset.df
+    with st.sidebar.expander("Filters", expanded=True):
+        filter_option, sel_animal, sel_sex, sel_groups = select_filters(
+            df,
+            key_prefix="cov_",
+            default_filter_option="By Sex and Social Group",
+            style="radio",
+        )
+        min_periods = st.slider(
+            "Minimum shared months", min_value=3, max_value=24, value=6, key="cov_min_periods"
+        )
+
+    st.title("Behavior Co-variation")
+    st.caption(
+        "Correlation of monthly behavior percentages within each individual, "
+        "averaged over the selected individuals."
+    )
+
+    if filter_option == "By Individual" and sel_animal:
+        covariation = behavior_covariation(dataset, min_periods=min_periods)
+        corr_matrix = covariation.xs(sel_animal, level="Focal Name").droplevel("Social Group")
+        show_matrix(corr_matrix, f"Behavior co-variation for {sel_animal}", "cov_animal_")
+        return
+
+    covariation = behavior_covariation(dataset, sexes=sel_sex, groups=sel_groups, min_periods=min_periods)
+    if covariation.empty:
+        st.warning("No data available for the selected filters.")
+        return
+
+    sex_text = ", ".join(sel_sex) if sel_sex else "All Sexes"
+    show_matrix(
+        covariation.groupby(level="Unified Behavior").mean(),
+        f"Colony co-variation | Sex: {sex_text}",
+        "cov_colony_",
+    )
+
+    group_names = list(covariation.index.get_level_values("Social Group").unique())
+    for tab, group in zip(st.tabs(group_names), group_names):
+        with tab:
+            group_matrix = covariation.xs(group, level="Social Group").groupby(level="Unified Behavior").mean()
+            show_matrix(group_matrix, f"{group} co-variation | Sex: {sex_text}", f"cov_{group}_")
+
+
+def main():
+    dataset = load_dataset()
+    if dataset.df.empty:
+        st.error("Data could not be loaded.")
+        return
+    check_dataset_freshness(dataset)
+    warmup_progress(warmup.status())
+    with query_cache.foreground():
+        run(dataset)
+    memory_debug(dataset)
+
+
+if __name__ == "__main__":
+    main()
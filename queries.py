@@ -0,0 +1,117 @@
+from cache import query_cache
+from trends import engine_for
+from logic import (
+    filter_data,
+    get_behavior_color_map,
+    calculate_group_means,
+    calculate_deviations,
+    calculate_behavior_covariation,
+    get_behavior_history,
+    get_behavior_history_by_filters,
+)
+
+
+def _freeze(values):
+    """Return a hashable form of a multiselect value."""
+    return None if values is None else tuple(values)
+
+
+def _filters(filter_option, animal, sexes, groups):
+    """Return the filter arguments that matter for ``filter_option``, hashable."""
+    if filter_option == "By Individual":
+        return filter_option, animal, None, None
+    return filter_option, None, _freeze(sexes), _freeze(groups)
+
+
+def behavior_color_map(dataset):
+    """Return :func:`logic.get_behavior_color_map` cached per dataset version."""
+    return query_cache.get_or_compute(
+        (dataset.version, "color_map"),
+        lambda: get_behavior_color_map(dataset.df),
+    )
+
+
+def filtered_data(dataset, start_date, end_date, filter_option, animal=None, sexes=None, groups=None):
+    """Return :func:`logic.filter_data` cached per dataset version and filters."""
+    filter_option, animal, sexes, groups = _filters(filter_option, animal, sexes, groups)
+    return query_cache.get_or_compute(
+        (dataset.version, "filter_data", start_date, end_date, filter_option, animal, sexes, groups),
+        lambda: filter_data(
+            dataset.df,
+            start_date,
+            end_date,
+            filter_option,
+            animal=animal,
+            sexes=sexes,
+            groups=groups,
+        ),
+    )
+
+
+def group_means(dataset, start_date, end_date, filter_option, animal=None, sexes=None, groups=None):
+    """Return :func:`logic.calculate_group_means` of a filtered subset."""
+    filter_option, animal, sexes, groups = _filters(filter_option, animal, sexes, groups)
+    return query_cache.get_or_compute(
+        (dataset.version, "group_means", start_date, end_date, filter_option, animal, sexes, groups),
+        lambda: calculate_group_means(
+            filtered_data(
+                dataset,
+                start_date,
+                end_date,
+                filter_option,
+                animal=animal,
+                sexes=sexes,
+                groups=groups,
+            )
+        ),
+    )
+
+
+def behavior_deviations(dataset, start_date, end_date, animal):
+    """Return :func:`logic.calculate_deviations` for one animal and period."""
+    return query_cache.get_or_compute(
+        (dataset.version, "deviations", start_date, end_date, animal),
+        lambda: calculate_deviations(
+            dataset.df,
+            filtered_data(dataset, start_date, end_date, "By Individual", animal=animal),
+            animal,
+        ),
+    )
+
+
+def behavior_history(dataset, animal, behavior):
+    """Return :func:`logic.get_behavior_history` cached per dataset version."""
+    return query_cache.get_or_compute(
+        (dataset.version, "history", animal, behavior),
+        lambda: get_behavior_history(dataset.df, animal, behavior),
+    )
+
+
+def behavior_history_by_filters(dataset, sexes=None, groups=None, behavior=None):
+    """Return :func:`logic.get_behavior_history_by_filters` cached per version."""
+    sexes, groups = _freeze(sexes), _freeze(groups)
+    return query_cache.get_or_compute(
+        (dataset.version, "history_by_filters", sexes, groups, behavior),
+        lambda: get_behavior_history_by_filters(
+            dataset.df, sexes=sexes, groups=groups, behavior=behavior
+        ),
+    )
+
+
+def behavior_covariation(dataset, sexes=None, groups=None, min_periods=6):
+    """Return :func:`logic.calculate_behavior_covariation` cached per version and filters."""
+    sexes, groups = _freeze(sexes), _freeze(groups)
+    return query_cache.get_or_compute(
+        (dataset.version, "covariation", sexes, groups, min_periods),
+        lambda: calculate_behavior_covariation(
+            dataset.df, sexes=sexes, groups=groups, min_periods=min_periods
+        ),
+    )
+
+
+def trend_summary(dataset, window=3):
+    """Return :meth:`trends.TrendEngine.summary` cached per dataset version."""
+    return query_cache.get_or_compute(
+        (dataset.version, "trends", window),
+        lambda: engine_for(dataset).summary(window=window),
+    )
@@ -0,0 +1,130 @@
+import json
+import threading
+from contextlib import contextmanager
+import urllib.error
+import urllib.request
+
+import pyarrow as pa
+import pytest
+from api import ApiServer
+from data_utils import DatasetStore
+
+
+CSV = (
+    "Date,Focal Name,Unified Behavior,Percentage,Sex,Social Group\n"
+    "2021-01,A,Play,10,Male,G1\n"
+    "2021-01,B,Play,20,Female,G1\n"
+    "2021-02,A,Play,30,Male,G1\n"
+    "2021-02,B,Play,40,Female,G1\n"
+    "2021-02,A,Rest,50,Male,G1\n"
+)
+
+
+@contextmanager
+def serve(csv_path):
+    server = ApiServer(("127.0.0.1", 0), DatasetStore(str(csv_path)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def api_url(tmp_path):
+    csv_path = tmp_path / "behavior.csv"
+    csv_path.write_text(CSV)
+    with serve(csv_path) as url:
+        yield url
+
+
+def get(url, headers=None):
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as response:
+        return response.status, response.headers, response.read()
+
+
+def test_filter_pages_json(api_url):
+    _, headers, body = get(f"{api_url}/filter?start=2021-01&end=2021-02&limit=2")
+    page = json.loads(body)
+    assert page["total"] == 5
+    assert len(page["data"]) == 2
+    assert page["data"][0]["Date"].startswith("2021-01-01")
+
+    _, _, body = get(api_url + page["next"])
+    assert json.loads(body)["offset"] == 2
+    assert headers["ETag"] == f'"{page["version"]}-json"'
+    assert headers["Vary"] == "Accept"
+
+
+def test_etag_skips_unchanged_results(api_url):
+    _, headers, _ = get(f"{api_url}/group-means")
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        get(f"{api_url}/group-means", headers={"If-None-Match": headers["ETag"]})
+    assert excinfo.value.code == 304
+
+
+def test_etag_lists_and_wildcard(api_url):
+    _, headers, _ = get(f"{api_url}/version")
+    for value in (f'"other", {headers["ETag"]}', "*", f"W/{headers['ETag']}"):
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            get(f"{api_url}/version", headers={"If-None-Match": value})
+        assert excinfo.value.code == 304
+    _, headers, _ = get(f"{api_url}/filter")
+    status, _, _ = get(f"{api_url}/filter", headers={"If-None-Match": headers["ETag"][:-2] + '"'})
+    assert status == 200
+
+
+def test_etag_does_not_hide_bad_requests(api_url):
+    _, headers, _ = get(f"{api_url}/deviations?animal=A")
+    for query in ("", "?animal=A&limit=-1", "?animal=A&start=nope"):
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            get(f"{api_url}/deviations{query}", headers={"If-None-Match": headers["ETag"]})
+        assert excinfo.value.code == 400
+
+
+def test_history_arrow_stream(api_url):
+    _, headers, body = get(
+        f"{api_url}/history?behavior=Play",
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+    assert headers["Content-Type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.column("Percentage").to_pylist() == [15, 35]
+
+
+def test_deviations_requires_animal(api_url):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        get(f"{api_url}/deviations")
+    assert excinfo.value.code == 400
+    _, _, body = get(f"{api_url}/deviations?animal=A&format=json")
+    behaviors = [row["Unified Behavior"] for row in json.loads(body)["data"]]
+    assert behaviors == ["Rest", "Play"]
+
+
+def test_trends_ranked_by_metric(api_url):
+    _, _, body = get(f"{api_url}/trends?metric=MoM%20Change&level=Focal%20Name")
+    rows = json.loads(body)["data"]
+    assert [row["Name"] for row in rows] == ["A", "B"]
+    assert rows[0]["MoM Change"] == 20
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        get(f"{api_url}/trends?metric=Unknown")
+    assert excinfo.value.code == 400
+
+
+def test_invalid_month_is_a_bad_request(api_url):
+    for value in ("NaT", "nan", "none", "2021-13"):
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            get(f"{api_url}/filter?start={value}")
+        assert excinfo.value.code == 400
+
+
+def test_unreadable_dataset_is_a_server_error(tmp_path):
+    csv_path = tmp_path / "behavior.csv"
+    csv_path.write_text("Date,Focal Name\nnot-a-date,Chimp")
+    with serve(csv_path) as url:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            get(f"{url}/version")
+    assert excinfo.value.code == 500
+    assert "error" in json.loads(excinfo.value.read())
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from logic import calculate_behavior_covariation, get_behavior_history, get_strongest_pairs
+
+
+def make_frame(periods=8):
+    months = pd.date_range("2021-01-01", periods=periods, freq="MS")
+    rows = []
+    for i, month in enumerate(months):
+        for animal, group, offset in [("A", "G1", 0), ("B", "G2", 3)]:
+            rows.append((month, animal, "Grooming", 10 + i + offset, "Male", group))
+            rows.append((month, animal, "Abnormal", 20 - i, "Male", group))
+            rows.append((month, animal, "Rest", 5 + (i * offset) % 4, "Male", group))
+    return pd.DataFrame(
+        rows,
+        columns=["Date", "Focal Name", "Unified Behavior", "Percentage", "Sex", "Social Group"],
+    )
+
+
+def test_covariation_matches_per_pair_history():
+    df = make_frame()
+    result = calculate_behavior_covariation(df, min_periods=3)
+    assert result.loc[("G1", "A", "Grooming"), "Abnormal"] == -1.0
+
+    for group, animal in [("G1", "A"), ("G2", "B")]:
+        series = {
+            behavior: get_behavior_history(df, animal, behavior).set_index("Date")["Percentage"]
+            for behavior in result.columns
+        }
+        expected = pd.DataFrame(series).corr(min_periods=3)
+        block = result.loc[(group, animal)]
+        np.testing.assert_allclose(block.to_numpy(), expected.to_numpy(), atol=1e-12)
+
+
+def test_covariation_constant_series_matches_corr():
+    df = make_frame(periods=12).astype({"Percentage": "float64"})
+    df.loc[df["Unified Behavior"] == "Rest", "Percentage"] = 0.3
+    result = calculate_behavior_covariation(df, min_periods=3)
+
+    series = {
+        behavior: get_behavior_history(df, "A", behavior).set_index("Date")["Percentage"]
+        for behavior in result.columns
+    }
+    expected = pd.DataFrame(series).corr(min_periods=3)
+    np.testing.assert_allclose(result.loc[("G1", "A")].to_numpy(), expected.to_numpy(), atol=1e-12)
+    assert result.loc[("G1", "A", "Rest")].isna().all()
+
+def test_covariation_respects_min_periods_and_filters():
+    df = make_frame()
+    df = df[~((df["Focal Name"] == "A") & (df["Unified Behavior"] == "Rest") & (df["Date"] > "2021-02-01"))]
+    result = calculate_behavior_covariation(df, groups=["G1"], min_periods=3)
+    assert set(result.index.get_level_values("Focal Name")) == {"A"}
+    assert np.isnan(result.loc[("G1", "A", "Rest"), "Grooming"])
+
+
+def test_get_strongest_pairs():
+    corr = pd.DataFrame(
+        [[1.0, -0.9, 0.1], [-0.9, 1.0, 0.5], [0.1, 0.5, 1.0]],
+        index=["Abnormal", "Grooming", "Rest"],
+        columns=["Abnormal", "Grooming", "Rest"],
+    )
+    pairs = get_strongest_pairs(corr, top=2)
+    assert list(zip(pairs["Behavior A"], pairs["Behavior B"])) == [
+        ("Abnormal", "Grooming"),
+        ("Grooming", "Rest"),
+    ]
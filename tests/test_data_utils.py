@@ -1,5 +1,10 @@
+import time
+from concurrent.futures import Future
+
 import pandas as pd
-from data_utils import load_data
+
+import data_utils
+from data_utils import DatasetStore, load_data, read_dataset
 
 
 def test_load_data(tmp_path, monkeypatch):
@@ -15,3 +20,75 @@ def test_load_data(tmp_path, monkeypatch):
         "Percentage",
     ]
     assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+
+
+def test_dataset_store_swaps_after_warm(tmp_path):
+    csv_path = tmp_path / "behavior.csv"
+    csv_path.write_text("Date,Focal Name,Unified Behavior,Percentage\n2024-01,Chimp,Play,10")
+    warmed = []
+    published = []
+    current_while_warming = []
+
+    def warm(dataset):
+        warmed.append(dataset.version)
+        current_while_warming.append(store.current())
+        return []
+
+    store = DatasetStore(str(csv_path), warm=warm)
+    store.subscribe(lambda dataset: published.append(dataset.version))
+    first = store.current()
+    assert warmed == published == [first.version]
+
+    csv_path.write_text("Date,Focal Name,Unified Behavior,Percentage\n2024-02,Chimp,Play,20")
+    second = store.rebuild()
+    assert second.version != first.version
+    assert store.current() is second
+    assert warmed == published == [first.version, second.version]
+    assert current_while_warming[-1] is first
+    assert pd.api.types.is_datetime64_any_dtype(second.df["Date"])
+
+
+def test_dataset_store_keeps_snapshot_on_bad_file(tmp_path):
+    csv_path = tmp_path / "behavior.csv"
+    csv_path.write_text("Date,Focal Name,Unified Behavior,Percentage\n2024-01,Chimp,Play,10")
+    store = DatasetStore(str(csv_path))
+    first = store.current()
+
+    csv_path.write_text("Date,Focal Name\nnot-a-date,Chimp")
+    assert store.rebuild() is None
+    assert store.current() is first
+
+
+def test_watched_bad_file_is_parsed_once(tmp_path, monkeypatch):
+    csv_path = tmp_path / "behavior.csv"
+    csv_path.write_text("Date,Focal Name,Unified Behavior,Percentage\n2024-01,Chimp,Play,10")
+    store = DatasetStore(str(csv_path), debounce=0.1)
+    first = store.current()
+    reads = []
+
+    def counting_read_dataset(*args, **kwargs):
+        reads.append(args)
+        return read_dataset(*args, **kwargs)
+
+    monkeypatch.setattr(data_utils, "read_dataset", counting_read_dataset)
+    store.watch()
+    try:
+        csv_path.write_text("Date,Focal Name\nnot-a-date,Chimp")
+        time.sleep(2)
+        assert len(reads) == 1
+        assert store.current() is first
+    finally:
+        store.stop()
+
+
+def test_dataset_store_publishes_after_warm_timeout(tmp_path):
+    csv_path = tmp_path / "behavior.csv"
+    csv_path.write_text("Date,Focal Name,Unified Behavior,Percentage\n2024-01,Chimp,Play,10")
+    stuck = Future()
+    store = DatasetStore(str(csv_path), warm=lambda dataset: [stuck], warm_timeout=0.1)
+    first = store.current()
+
+    csv_path.write_text("Date,Focal Name,Unified Behavior,Percentage\n2024-02,Chimp,Play,20")
+    second = store.rebuild()
+    assert second.version != first.version
+    assert store.current() is second
@@ -0,0 +1,51 @@
+import pandas as pd
+from data_utils import compact_schema, standard_schema
+from logic import filter_data, get_behavior_history_by_filters, get_date_range
+from memory import deep_size, layout_savings
+
+
+def make_frame():
+    data = {
+        "Date": ["2021-01", "2021-01", "2021-02", "2021-02", "2021-03"],
+        "Focal Name": ["A", "B", "A", "B", "A"],
+        "Unified Behavior": ["Play", "Play", "Play", "Play", "Rest"],
+        "Percentage": [10.5, 20.0, 30.0, 40.0, 50.0],
+        "Sex": ["Male", "Female", "Male", "Female", "Male"],
+        "Social Group": ["G1", "G1", "G1", "G1", "G2"],
+    }
+    df = pd.DataFrame(data)
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def test_compact_schema_round_trip():
+    df = make_frame()
+    compact = compact_schema(df)
+    assert compact["Date"].dtype == "int32"
+    assert compact["Percentage"].dtype == "float32"
+    assert isinstance(compact["Focal Name"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(standard_schema(compact), df)
+    assert compact_schema(compact)["Date"].equals(compact["Date"])
+
+
+def test_logic_accepts_compact_schema():
+    df = make_frame()
+    compact = compact_schema(df)
+    assert get_date_range(compact) == get_date_range(df)
+
+    start, end = pd.Timestamp("2021-01-15"), pd.Timestamp("2021-03-31")
+    expected = filter_data(df, start, end, "By Sex and Social Group", sexes=["Male"], groups=["G1", "G2"])
+    result = filter_data(compact, start, end, "By Sex and Social Group", sexes=["Male"], groups=["G1", "G2"])
+    pd.testing.assert_frame_equal(standard_schema(result), expected)
+
+    expected = get_behavior_history_by_filters(df, sexes=["Male", "Female"], behavior="Play")
+    result = get_behavior_history_by_filters(compact, sexes=["Male", "Female"], behavior="Play")
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_layout_savings():
+    df = make_frame()
+    report = layout_savings(df, compact_schema(df))
+    assert report.loc["Date", "compact"] < report.loc["Date", "standard"]
+    assert report.loc["Total", "saved"] > 0
+    assert deep_size({"frame": df}) > df.memory_usage(deep=True).sum()
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trends import TrendEngine, biggest_movers
+
+
+def make_frame(months=14):
+    dates = pd.date_range("2021-01-01", periods=months, freq="MS")
+    rows = []
+    for i, date in enumerate(dates):
+        rows.append((date, "A", "Play", 10.0 + i, "Male", "G1"))
+        rows.append((date, "B", "Play", 20.0 - 2 * i, "Female", "G1"))
+    return pd.DataFrame(
+        rows,
+        columns=["Date", "Focal Name", "Unified Behavior", "Percentage", "Sex", "Social Group"],
+    )
+
+
+def series(summary, level, name, behavior="Play"):
+    mask = (summary["Level"] == level) & (summary["Name"] == name) & (summary["Unified Behavior"] == behavior)
+    return summary[mask].iloc[0]
+
+
+def test_summary_metrics():
+    summary = TrendEngine.build(make_frame()).summary(window=3)
+    animal = series(summary, "Focal Name", "A")
+    assert animal["Latest"] == 23.0
+    assert animal["MoM Change"] == 1.0
+    assert animal["YoY Change"] == 12.0
+    assert animal["Rolling Mean"] == 22.0
+    assert animal["Rolling Slope"] == pytest.approx(1.0)
+
+    group = series(summary, "Social Group", "G1")
+    assert group["Latest"] == pytest.approx((23.0 + -6.0) / 2)
+    assert group["Rolling Slope"] == pytest.approx(-0.5)
+
+
+def test_update_appends_months_incrementally():
+    df = make_frame()
+    base = TrendEngine.build(df[df["Date"] < "2022-02-01"])
+    updated = base.update(df)
+    full = TrendEngine.build(df)
+    assert updated.last_month == full.last_month
+    assert updated.columns == full.columns
+    np.testing.assert_array_equal(updated.values, full.values)
+    assert len(base.months) == len(full.months) - 1
+
+    with pytest.raises(ValueError):
+        updated.extend(df[df["Date"] == "2022-02-01"])
+
+
+def test_update_rebuilds_when_history_changes():
+    df = make_frame()
+    base = TrendEngine.build(df[df["Date"] < "2022-02-01"])
+    changed = df.copy()
+    changed.loc[0, "Percentage"] = 99.0
+    updated = base.update(changed)
+    assert updated.values[0, 0] == 99.0
+
+
+def test_gaps_keep_lags_positional():
+    df = make_frame()
+    df = df[df["Date"] != "2022-01-01"]
+    summary = TrendEngine.build(df).summary()
+    animal = series(summary, "Focal Name", "A")
+    assert np.isnan(animal["MoM Change"])
+    assert animal["YoY Change"] == 12.0
+
+
+def test_biggest_movers():
+    summary = TrendEngine.build(make_frame()).summary()
+    movers = biggest_movers(summary, "MoM Change", levels=["Focal Name"], top=1)
+    assert list(movers["Name"]) == ["B"]
@@ -0,0 +1,89 @@
+import threading
+
+import pandas as pd
+from cache import QueryCache, query_cache
+from data_utils import dataset_from_frame
+from warmup import Warmup, default_views, latest_period
+
+
+def make_dataset():
+    data = {
+        "Date": ["2021-01", "2021-01", "2021-02", "2021-02"],
+        "Focal Name": ["A", "B", "A", "B"],
+        "Unified Behavior": ["Play", "Play", "Play", "Play"],
+        "Percentage": [10, 20, 30, 40],
+        "Sex": ["Male", "Female", "Male", "Female"],
+        "Social Group": ["G1", "G2", "G1", "G2"],
+    }
+    df = pd.DataFrame(data)
+    df["Date"] = pd.to_datetime(df["Date"])
+    return dataset_from_frame(df, source="test")
+
+
+def test_query_cache_computes_once():
+    cache = QueryCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_compute(("v1", "x"), compute) == "value"
+    assert cache.get_or_compute(("v1", "x"), compute) == "value"
+    assert len(calls) == 1
+    assert cache.retain_version("v2") == 1
+    assert ("v1", "x") not in cache
+
+
+def test_latest_period():
+    start, end = latest_period(make_dataset().df)
+    assert start == pd.Timestamp("2021-02-01")
+    assert end == pd.Timestamp("2021-02-28")
+
+
+def test_warmup_fills_cache():
+    dataset = make_dataset()
+    runner = Warmup()
+    futures = runner.start(dataset)
+    for future in futures:
+        future.result()
+
+    status = runner.status()
+    assert status.version == dataset.version
+    assert status.done == len(default_views(dataset))
+    assert status.failed == 0
+    assert not status.running
+    assert (dataset.version, "color_map") in query_cache
+    assert runner.start(dataset) == []
+
+
+def test_warmup_yields_to_user_requests():
+    dataset = make_dataset()
+    runner = Warmup()
+    entered = threading.Event()
+    release = threading.Event()
+
+    def user_request():
+        with query_cache.foreground():
+            entered.set()
+            release.wait()
+
+    thread = threading.Thread(target=user_request)
+    thread.start()
+    entered.wait()
+    futures = runner.start(dataset)
+    assert runner.status().done == 0
+    release.set()
+    thread.join()
+    for future in futures:
+        future.result()
+    assert runner.status().done == runner.status().total
+
+
+def test_warmup_runs_under_steady_traffic():
+    dataset = make_dataset()
+    runner = Warmup(idle_timeout=0.05)
+    with query_cache.foreground():
+        for future in runner.start(dataset):
+            future.result(timeout=30)
+    assert runner.status().done == runner.status().total
@@ -0,0 +1,195 @@
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from logic import to_month_ordinal
+
+LEVELS = ["Focal Name", "Social Group", "Sex", "Colony"]
+METRICS = ["MoM Change", "YoY Change", "Rolling Mean", "Rolling Slope"]
+
+
+def _month_ordinals(dates):
+    if pd.api.types.is_integer_dtype(dates):
+        return dates.astype("int64")
+    return to_month_ordinal(dates).astype("int64")
+
+
+def _checksum(df):
+    """Return an order-independent fingerprint of the rows of ``df``."""
+    if df.empty:
+        return 0
+    return int(pd.util.hash_pandas_object(df, index=False).to_numpy().sum(dtype="uint64"))
+
+
+def _month_table(df, months):
+    """Return monthly means, one column per ``(level, name, behavior)`` series."""
+    frame = df.assign(Month=months.to_numpy(), Colony="All")
+    parts = []
+    for level in LEVELS:
+        table = frame.pivot_table(
+            index="Month",
+            columns=[level, "Unified Behavior"],
+            values="Percentage",
+            aggfunc="mean",
+            observed=True,
+        )
+        table.columns = pd.MultiIndex.from_tuples(
+            [(level, name, behavior) for name, behavior in table.columns]
+        )
+        parts.append(table)
+    return pd.concat(parts, axis=1)
+
+
+class TrendEngine:
+    """Monthly series of every animal, group, sex and the colony per behavior.
+
+    The series are stored as one month-by-series matrix, so period-over-period
+    metrics for all of them are a few vectorized operations on its last rows.
+    Engines are never modified once built: :meth:`extend` returns a new
+    engine with appended months added, without re-reading earlier ones.
+    """
+
+    def __init__(self):
+        self.months = np.empty(0, dtype="int64")
+        self.values = np.empty((0, 0))
+        self.columns = []
+        self.row_count = 0
+        self.checksum = 0
+
+    @classmethod
+    def build(cls, df):
+        """Return an engine holding every month of ``df``."""
+        return cls().extend(df)
+
+    @property
+    def last_month(self):
+        return int(self.months[-1]) if len(self.months) else None
+
+    def extend(self, rows):
+        """Return a new engine with ``rows`` from months after :attr:`last_month` added.
+
+        Raises
+        ------
+        ValueError
+            If ``rows`` contains a month that is already loaded.
+        """
+        engine = TrendEngine()
+        engine.months, engine.values, engine.columns = self.months, self.values, list(self.columns)
+        engine.row_count = self.row_count + len(rows)
+        engine.checksum = (self.checksum + _checksum(rows)) % 2**64
+        if rows.empty:
+            return engine
+
+        months = _month_ordinals(rows["Date"])
+        if self.last_month is not None and months.min() <= self.last_month:
+            raise ValueError("Only months after the last loaded month can be appended")
+        table = _month_table(rows, months)
+
+        first = months.min() if self.last_month is None else self.last_month + 1
+        new_months = np.arange(first, months.max() + 1, dtype="int64")
+        known = {key: i for i, key in enumerate(engine.columns)}
+        engine.columns += [key for key in table.columns if key not in known]
+        known = {key: i for i, key in enumerate(engine.columns)}
+
+        # Gaps become NaN rows so that lags stay positional (1 = MoM, 12 = YoY).
+        block = np.full((len(new_months), len(engine.columns)), np.nan)
+        positions = [known[key] for key in table.columns]
+        block[np.ix_(table.index.to_numpy() - first, positions)] = table.to_numpy(dtype="float64")
+        old = np.full((len(self.months), len(engine.columns)), np.nan)
+        old[:, : self.values.shape[1]] = self.values
+        engine.months = np.concatenate([self.months, new_months])
+        engine.values = np.vstack([old, block])
+        return engine
+
+    def update(self, df):
+        """Return an engine for ``df``, reusing this one if ``df`` only adds months.
+
+        Rows up to :attr:`last_month` are compared by count and checksum; if
+        they changed, the engine is rebuilt from scratch.
+        """
+        if self.last_month is None:
+            return TrendEngine.build(df)
+        months = _month_ordinals(df["Date"])
+        known = (months <= self.last_month).to_numpy()
+        if known.sum() != self.row_count or _checksum(df[known]) != self.checksum:
+            return TrendEngine.build(df)
+        return self.extend(df[~known])
+
+    def summary(self, window=3):
+        """Return the latest value and trend metrics of every series.
+
+        ``MoM Change`` and ``YoY Change`` compare the latest month with the
+        previous month and the same month a year earlier. ``Rolling Mean``
+        and ``Rolling Slope`` (percentage points per month, least squares)
+        use the last ``window`` months, ignoring months without data.
+        """
+        columns = ["Level", "Name", "Unified Behavior", "Month", "Latest"] + METRICS
+        if not len(self.months):
+            return pd.DataFrame(columns=columns)
+        values = self.values
+
+        def lag(n):
+            return values[-1 - n] if len(values) > n else np.full(values.shape[1], np.nan)
+
+        tail = values[-window:]
+        observed = ~np.isnan(tail)
+        count = observed.sum(axis=0)
+        x = np.arange(len(tail), dtype="float64")[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            rolling_mean = np.nanmean(tail, axis=0)
+            x_mean = (x * observed).sum(axis=0) / count
+            dx = np.where(observed, x - x_mean, 0.0)
+            dy = np.where(observed, tail - rolling_mean, 0.0)
+            slope = (dx * dy).sum(axis=0) / (dx * dx).sum(axis=0)
+        slope[count < 2] = np.nan
+
+        keys = pd.DataFrame(self.columns, columns=["Level", "Name", "Unified Behavior"])
+        return keys.assign(
+            Month=pd.Timestamp(np.datetime64(self.last_month, "M")),
+            Latest=values[-1],
+            **{
+                "MoM Change": values[-1] - lag(1),
+                "YoY Change": values[-1] - lag(12),
+                "Rolling Mean": rolling_mean,
+                "Rolling Slope": slope,
+            },
+        )[columns]
+
+
+def biggest_movers(summary, metric="MoM Change", levels=None, top=20):
+    """Return the ``top`` series of ``summary`` with the largest absolute ``metric``."""
+    if levels is not None:
+        summary = summary[summary["Level"].isin(levels)]
+    summary = summary.dropna(subset=[metric])
+    order = summary[metric].abs().sort_values(ascending=False).index
+    return summary.loc[order].head(top).reset_index(drop=True)
+
+
+_latest = None
+_latest_lock = threading.Lock()
+
+
+def engine_for(dataset):
+    """Return a :class:`TrendEngine` for ``dataset``.
+
+    The engine of the most recently loaded version is extended when the new
+    data only appends months to it.
+    """
+    global _latest
+    with _latest_lock:
+        previous = _latest
+    if previous is None:
+        engine = TrendEngine.build(dataset.df)
+    elif previous[0] == dataset.version:
+        return previous[2]
+    else:
+        engine = previous[2].update(dataset.df)
+    with _latest_lock:
+        # Sessions still holding an older snapshot must not replace the base
+        # that the next version will be extended from.
+        if _latest is None or dataset.loaded_at >= _latest[1]:
+            _latest = (dataset.version, dataset.loaded_at, engine)
+    return engine
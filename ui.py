@@ -5,11 +5,23 @@ import plotly.graph_objects as go
 from datetime import datetime
 from pandas.tseries.offsets import MonthEnd
 
+from data_utils import compact_schema, standard_schema
+from logic import get_date_range
+from memory import (
+    enabled as memory_debug_enabled,
+    cache_footprint,
+    deep_size,
+    format_bytes,
+    layout_savings,
+    log_memory_report,
+    session_footprints,
+)
+from warmup import SEX_OPTIONS
+
 
 def select_period(df, key_prefix=""):
     """Return a start and end ``pd.Timestamp`` based on user input."""
-    min_date = df["Date"].min()
-    max_date = df["Date"].max()
+    min_date, max_date = get_date_range(df)
 
     years = range(min_date.year, max_date.year + 1)
     months = range(1, 13)
@@ -109,7 +121,7 @@ def select_filters(
         selected_sex = None
         selected_groups = None
     else:
-        sex_options = ["Male", "Female"]
+        sex_options = list(SEX_OPTIONS)
         group_options = df["Social Group"].unique()
 
         selected_animal = None
@@ -133,12 +145,13 @@ def create_bar_chart(df_filtered, behavior_order=None, color_map=None, title="Ac
     """Display a bar chart for the provided data."""
     if behavior_order is not None:
         behavior_order = list(dict.fromkeys(behavior_order))
+        df_filtered = df_filtered.astype({"Unified Behavior": object})
         df_filtered.loc[:, "Unified Behavior"] = pd.Categorical(
             df_filtered["Unified Behavior"], categories=behavior_order, ordered=True
         )
 
     df_grouped = (
-        df_filtered.groupby("Unified Behavior", observed=False)["Percentage"].mean().reset_index().sort_values(by="Percentage", ascending=False)
+        df_filtered.groupby("Unified Behavior", observed=True)["Percentage"].mean().reset_index().sort_values(by="Percentage", ascending=False)
     )
 
     if behavior_order is not None:
@@ -161,6 +174,7 @@ def create_bar_chart(df_filtered, behavior_order=None, color_map=None, title="Ac
         yaxis=dict(range=[0, y_max]) if y_max else {},
     )
 
+    session_footprints.record(f"figure: {title}", fig)
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -189,6 +203,7 @@ def create_deviation_bar_chart(deviations, title):
         showlegend=True,
     )
 
+    session_footprints.record(f"figure: {title}", fig)
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -210,6 +225,29 @@ def create_history_line_chart(df_line, title):
         template="plotly_dark",
     )
     fig.update_layout(xaxis_title="Month", yaxis_title="Percentage")
+    session_footprints.record(f"figure: {title}", fig)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def create_correlation_heatmap(corr_matrix, title):
+    """Display a behavior-by-behavior correlation matrix as a heatmap."""
+    if corr_matrix.isna().all().all():
+        st.warning("Not enough overlapping months to compute correlations.")
+        return
+
+    fig = px.imshow(
+        corr_matrix,
+        color_continuous_scale="RdBu",
+        zmin=-1,
+        zmax=1,
+        text_auto=".2f",
+        aspect="auto",
+        title=title,
+        labels={"color": "Correlation"},
+        template="plotly_dark",
+    )
+    fig.update_layout(xaxis_title="", yaxis_title="", xaxis_tickangle=-45)
+    session_footprints.record(f"figure: {title}", fig)
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -222,6 +260,8 @@ def download_filtered_data(df_filtered, key_prefix=""):
 
     output = BytesIO()
     df_filtered.to_excel(output, index=False)
+    excel = output.getvalue()
+    session_footprints.record(f"exports: {key_prefix or 'filtered'}", (csv, excel))
 
     csv_key = f"{key_prefix}csv" if key_prefix else "csv"
     excel_key = f"{key_prefix}excel" if key_prefix else "excel"
@@ -238,7 +278,7 @@ def download_filtered_data(df_filtered, key_prefix=""):
     with col_excel:
         st.download_button(
             "Download Excel",
-            data=output.getvalue(),
+            data=excel,
             file_name="filtered_behavior.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             key=excel_key,
@@ -286,3 +326,34 @@ def sticky_filters(container):
         unsafe_allow_html=True,
     )
     return container
+
+
+def warmup_progress(status):
+    """Show background cache warm-up progress in the sidebar while it runs."""
+    if not status.running:
+        return
+    st.sidebar.progress(
+        status.fraction,
+        text=f"Preparing views: {status.done + status.failed}/{status.total}",
+    )
+
+
+def memory_debug(dataset):
+    """Show deep memory per cached object and session in the sidebar.
+
+    Only rendered when ``DASHBOARD_MEMORY_DEBUG=1``; the same figures are
+    written to the log.
+    """
+    if not memory_debug_enabled():
+        return
+    caches = cache_footprint()
+    sessions = session_footprints.report()
+    with st.sidebar.expander("Memory", expanded=False):
+        st.metric("Dataset", format_bytes(deep_size(dataset.df)))
+        st.metric("Query cache", format_bytes(caches["bytes"].sum()), f"{len(caches)} entries", delta_color="off")
+        st.dataframe(caches.groupby("query")["bytes"].agg(["count", "sum"]).sort_values("sum", ascending=False))
+        st.caption("Sessions")
+        st.dataframe(sessions.groupby("session")["bytes"].sum())
+        st.caption("Compact schema savings")
+        st.dataframe(layout_savings(standard_schema(dataset.df), compact_schema(dataset.df)))
+    log_memory_report(dataset)
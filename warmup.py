@@ -0,0 +1,222 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+
+import pandas as pd
+from pandas.tseries.offsets import MonthEnd
+
+import queries
+from cache import query_cache
+from logic import filter_data, get_date_range
+
+logger = logging.getLogger(__name__)
+
+SEX_OPTIONS = ["Male", "Female"]
+
+
+@dataclass(frozen=True)
+class WarmupStatus:
+    """Progress of the warm-up run for one dataset version."""
+
+    version: str = None
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    started_at: pd.Timestamp = None
+    finished_at: pd.Timestamp = None
+
+    @property
+    def running(self):
+        return self.version is not None and self.finished_at is None
+
+    @property
+    def fraction(self):
+        return (self.done + self.failed) / self.total if self.total else 1.0
+
+
+def latest_period(df):
+    """Return the month ``select_period`` shows by default."""
+    _, latest = get_date_range(df)
+    start_date = pd.Timestamp(year=latest.year, month=latest.month, day=1)
+    return start_date, start_date + MonthEnd(1)
+
+
+def default_views(dataset):
+    """Return ``(label, job)`` pairs for the views each page renders by default."""
+    df = dataset.df
+    start_date, end_date = latest_period(df)
+    groups = list(df["Social Group"].unique())
+    animals = df["Focal Name"].unique()
+    behaviors = df["Unified Behavior"].unique()
+    latest_animals = set(filter_data(df, start_date, end_date, None)["Focal Name"])
+
+    jobs = [
+        ("color map", partial(queries.behavior_color_map, dataset)),
+        (
+            "latest month",
+            partial(
+                queries.filtered_data,
+                dataset,
+                start_date,
+                end_date,
+                "By Sex and Social Group",
+                sexes=SEX_OPTIONS,
+                groups=groups,
+            ),
+        ),
+    ]
+    jobs.append(("trends", partial(queries.trend_summary, dataset)))
+    jobs.append(
+        (
+            "co-variation",
+            partial(queries.behavior_covariation, dataset, sexes=SEX_OPTIONS, groups=groups),
+        )
+    )
+    for group in groups:
+        jobs.append(
+            (
+                f"latest month: {group}",
+                partial(
+                    queries.filtered_data,
+                    dataset,
+                    start_date,
+                    end_date,
+                    "By Sex and Social Group",
+                    sexes=SEX_OPTIONS,
+                    groups=[group],
+                ),
+            )
+        )
+    for animal in animals:
+        if animal in latest_animals:
+            jobs.append(
+                (
+                    f"latest month: {animal}",
+                    partial(queries.behavior_deviations, dataset, start_date, end_date, animal),
+                )
+            )
+    for behavior in behaviors:
+        jobs.append(
+            (
+                f"history: {behavior}",
+                partial(
+                    queries.behavior_history_by_filters,
+                    dataset,
+                    sexes=SEX_OPTIONS,
+                    groups=groups,
+                    behavior=behavior,
+                ),
+            )
+        )
+        for group in groups:
+            jobs.append(
+                (
+                    f"history: {behavior} in {group}",
+                    partial(
+                        queries.behavior_history_by_filters,
+                        dataset,
+                        sexes=SEX_OPTIONS,
+                        groups=[group],
+                        behavior=behavior,
+                    ),
+                )
+            )
+        for animal in animals:
+            jobs.append(
+                (
+                    f"history: {behavior} for {animal}",
+                    partial(queries.behavior_history, dataset, animal, behavior),
+                )
+            )
+    return jobs
+
+
+class Warmup:
+    """Precompute default views on a thread pool whenever the dataset changes.
+
+    Jobs wait for in-flight user requests before running, so a visitor is
+    never queued behind warm-up work, and jobs left over from a replaced
+    dataset version are skipped. A job waits at most ``idle_timeout``
+    seconds, so steady traffic cannot stall warm-up indefinitely.
+    """
+
+    def __init__(self, max_workers=2, idle_timeout=5.0):
+        self.idle_timeout = idle_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warmup")
+        self._lock = threading.Lock()
+        self._status = WarmupStatus()
+        self._futures = []
+
+    def status(self):
+        """Return a snapshot of the current warm-up progress."""
+        with self._lock:
+            return self._status
+
+    def start(self, dataset):
+        """Schedule the default views of ``dataset``, abandoning older runs.
+
+        Starting the version that is already warming or warm is a no-op.
+        """
+        if dataset.df.empty or self.status().version == dataset.version:
+            return []
+        jobs = default_views(dataset)
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+            self._status = WarmupStatus(
+                version=dataset.version,
+                total=len(jobs),
+                started_at=pd.Timestamp.now(),
+            )
+            self._futures = [
+                self._executor.submit(self._run, dataset.version, label, job)
+                for label, job in jobs
+            ]
+            futures = list(self._futures)
+        logger.info("Warm-up of dataset %s started: %d views", dataset.version, len(jobs))
+        return futures
+
+    def _run(self, version, label, job):
+        query_cache.wait_until_idle(self.idle_timeout)
+        with self._lock:
+            if self._status.version != version:
+                return
+        try:
+            job()
+            failed = False
+        except Exception:
+            logger.exception("Warm-up of %r failed", label)
+            failed = True
+        self._advance(version, failed)
+
+    def _advance(self, version, failed):
+        with self._lock:
+            status = self._status
+            if status.version != version:
+                return
+            status = replace(
+                status,
+                done=status.done + (not failed),
+                failed=status.failed + failed,
+            )
+            completed = status.done + status.failed
+            if completed == status.total:
+                status = replace(status, finished_at=pd.Timestamp.now())
+            self._status = status
+        step = max(status.total // 10, 1)
+        if completed == status.total:
+            elapsed = (status.finished_at - status.started_at).total_seconds()
+            logger.info(
+                "Warm-up of dataset %s finished: %d views in %.1fs (%d failed)",
+                version,
+                status.done,
+                elapsed,
+                status.failed,
+            )
+        elif completed % step == 0:
+            logger.info("Warm-up of dataset %s: %d/%d views", version, completed, status.total)
+
+
+warmup = Warmup()